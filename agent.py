@@ -1,11 +1,14 @@
+import asyncio
 import logging
+from datetime import datetime
 from dotenv import load_dotenv
 
 from livekit import agents
-from livekit.agents import Agent, AgentSession, RoomInputOptions, AgentServer
+from livekit.agents import Agent, AgentSession, RoomInputOptions, AgentServer, JobProcess, TurnHandlingOptions
 from livekit.plugins import deepgram, cartesia, silero, anthropic
 
-from properties import get_all_properties, get_property_details, check_availability
+from properties import LOCAL_TIMEZONE, get_all_properties, get_property_details, load_properties_from_db
+from leads import enqueue_lead, flush_leads
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
@@ -14,8 +17,16 @@ logger = logging.getLogger("mtr-agent")
 # Create server for explicit agent dispatch (required for telephony)
 server = AgentServer()
 
-# Store leads in memory (just for demo - logs to console)
-leads = []
+
+def prewarm(proc: JobProcess):
+    """Load the VAD model once per worker process instead of once per call."""
+    proc.userdata["vad"] = silero.VAD.load()
+
+
+server.setup_fnc = prewarm
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected
+_background_tasks: set[asyncio.Task] = set()
 
 
 SYSTEM_PROMPT = """You work at Assurance Property Management answering calls about furnished rentals.
@@ -31,42 +42,35 @@ If you can't help with something, offer to take a message for Patrick."""
 
 class MTRAgent(Agent):
     def __init__(self):
+        # Today's date lets the model turn "March 1st" into a full YYYY-MM-DD
+        # for the availability check; it stays fixed for the whole call
+        today = datetime.now(LOCAL_TIMEZONE)
         super().__init__(
-            instructions=SYSTEM_PROMPT,
+            instructions=f"{SYSTEM_PROMPT}\n\nToday is {today:%A, %B} {today.day}, {today.year}.",
         )
 
     @agents.llm.function_tool
     async def list_available_properties(self) -> str:
-        """Get a summary of all available rental properties."""
+        """List available rental properties."""
         logger.info("Tool called: list_available_properties")
-        return get_all_properties()
+        return await asyncio.to_thread(get_all_properties)
 
     @agents.llm.function_tool
-    async def get_property_info(self, property_name: str) -> str:
-        """Get detailed information about a specific property.
-        
-        Args:
-            property_name: The name or type of property (e.g., 'studio', '2-bedroom', 'downtown', 'north boulder')
-        """
-        logger.info(f"Tool called: get_property_info({property_name})")
-        return get_property_details(property_name)
-
-    @agents.llm.function_tool
-    async def check_property_availability(
-        self, 
-        property_name: str, 
-        move_in_date: str, 
-        move_out_date: str
+    async def get_property_info(
+        self,
+        property_name: str,
+        move_in_date: str = "",
+        move_out_date: str = ""
     ) -> str:
-        """Check if a property is available for specific dates.
-        
+        """Get details about a property, and check dates if given.
+
         Args:
-            property_name: The name or type of property
-            move_in_date: When the renter wants to move in
-            move_out_date: When the renter plans to move out
+            property_name: Property city, nickname, or type
+            move_in_date: Move-in date, YYYY-MM-DD
+            move_out_date: Move-out date, YYYY-MM-DD
         """
-        logger.info(f"Tool called: check_property_availability({property_name}, {move_in_date}, {move_out_date})")
-        return check_availability(property_name, move_in_date, move_out_date)
+        logger.info("Tool called: get_property_info(%s, %s, %s)", property_name, move_in_date, move_out_date)
+        return await asyncio.to_thread(get_property_details, property_name, move_in_date, move_out_date)
 
     @agents.llm.function_tool
     async def save_lead(
@@ -76,13 +80,13 @@ class MTRAgent(Agent):
         property_interest: str = "",
         notes: str = ""
     ) -> str:
-        """Save a potential renter's contact information for follow-up.
-        
+        """Save a renter's contact info for follow-up.
+
         Args:
-            name: The renter's name
-            email: The renter's email address
-            property_interest: Which property they're interested in (optional)
-            notes: Any additional notes about their inquiry (optional)
+            name: Renter's name
+            email: Renter's email
+            property_interest: Property they want
+            notes: Other notes
         """
         lead = {
             "name": name,
@@ -90,25 +94,47 @@ class MTRAgent(Agent):
             "property_interest": property_interest,
             "notes": notes
         }
-        leads.append(lead)
-        logger.info(f"Lead saved: {lead}")
+        await enqueue_lead(lead)
+        logger.info("Lead queued: %s", lead)
         
-        return f"I've saved your information. Someone from our team will reach out to {email} within 24 hours to help you with next steps for the {property_interest if property_interest else 'property'}."
+        return f"I've got your information. Someone from our team will reach out to {email} within 24 hours to help you with next steps for the {property_interest if property_interest else 'property'}."
 
 
 @server.rtc_session(agent_name="mtr-voice-agent")
 async def entrypoint(ctx: agents.JobContext):
     """Main entry point for the voice agent."""
 
-    logger.info(f"Agent starting for room: {ctx.room.name}")
-
+    logger.info("Agent starting for room: %s", ctx.room.name)
+
+    # Write any leads still queued before the job process exits
+    ctx.add_shutdown_callback(flush_leads)
+
+    stt = deepgram.STT()
+    # Cache the system prompt, tool definitions, and history between turns
+    llm = anthropic.LLM(model="claude-haiku-4-5-20251001", caching="ephemeral")
+    # Cartesia's default blingfire splitter already emits one sentence at a
+    # time and keeps "Mr.", "St.", and prices intact
+    tts = cartesia.TTS()
+
+    # Open provider connections and fill the property cache in the
+    # background, so the greeting never waits on the database
+    llm.prewarm()
+    tts.prewarm()
+    cache_warmup = asyncio.create_task(asyncio.to_thread(load_properties_from_db))
+    _background_tasks.add(cache_warmup)
+    cache_warmup.add_done_callback(_background_tasks.discard)
     await ctx.connect()
 
     session = AgentSession(
-        vad=silero.VAD.load(),
-        stt=deepgram.STT(),
-        llm=anthropic.LLM(model="claude-sonnet-4-20250514"),
-        tts=cartesia.TTS(),
+        vad=ctx.proc.userdata["vad"],
+        stt=stt,
+        llm=llm,
+        tts=tts,
+        # Preemptive LLM generation and interruptions are on by default; also
+        # start synthesizing the reply before end of turn is confirmed
+        turn_handling=TurnHandlingOptions(
+            preemptive_generation={"preemptive_tts": True},
+        ),
     )
 
     await session.start(
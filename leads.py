@@ -0,0 +1,115 @@
+"""
+Lead capture for follow-up, persisted to Midway PostgreSQL.
+
+Leads are queued in memory and written in batches by a background task,
+so saving a lead from a tool call never waits on the database.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Optional
+
+from psycopg2.extras import execute_values
+
+from properties import get_db_connection, release_db_connection
+
+logger = logging.getLogger("mtr-agent.leads")
+
+# Flush once this many leads are queued, or this long after the first one arrives
+LEAD_BATCH_SIZE = 50
+LEAD_FLUSH_SECONDS = 2.0
+
+_lead_queue: Optional[asyncio.Queue] = None
+_lead_writer_task: Optional[asyncio.Task] = None
+# The batch insert currently running in a worker thread, if any
+_lead_insert: Optional[asyncio.Future] = None
+
+
+async def enqueue_lead(lead: dict) -> None:
+    """Queue a lead for the background writer, starting it if needed."""
+    global _lead_queue, _lead_writer_task
+    if _lead_queue is None:
+        _lead_queue = asyncio.Queue()
+    if _lead_writer_task is None or _lead_writer_task.done():
+        _lead_writer_task = asyncio.create_task(_lead_writer())
+    await _lead_queue.put(lead)
+
+
+async def flush_leads() -> None:
+    """Stop the background writer and persist anything still queued. Call on shutdown."""
+    global _lead_writer_task
+    if _lead_writer_task is not None:
+        _lead_writer_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _lead_writer_task
+        _lead_writer_task = None
+
+    # Cancelling the writer doesn't stop a write already in progress; wait for it
+    if _lead_insert is not None:
+        await _lead_insert
+
+    if _lead_queue is None or _lead_queue.empty():
+        return
+
+    batch = []
+    while not _lead_queue.empty():
+        batch.append(_lead_queue.get_nowait())
+    await asyncio.to_thread(_insert_leads, batch)
+
+
+async def _lead_writer() -> None:
+    """Drain the queue in batches of up to LEAD_BATCH_SIZE leads."""
+    global _lead_insert
+    loop = asyncio.get_running_loop()
+
+    while True:
+        batch = []
+        try:
+            batch.append(await _lead_queue.get())
+            deadline = loop.time() + LEAD_FLUSH_SECONDS
+
+            while len(batch) < LEAD_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(_lead_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Hand the partial batch back so flush_leads() writes it
+            for lead in batch:
+                _lead_queue.put_nowait(lead)
+            raise
+
+        # Shielded so cancelling the writer leaves the insert running for flush_leads() to await
+        _lead_insert = asyncio.ensure_future(asyncio.to_thread(_insert_leads, batch))
+        await asyncio.shield(_lead_insert)
+
+
+def _insert_leads(batch: list[dict]) -> None:
+    """
+    Insert a batch of leads in a single statement.
+    The table comes from migrations/001_voice_agent_lead.sql.
+    """
+    conn = get_db_connection()
+    if not conn:
+        logger.error("Could not connect to database, %d lead(s) not saved: %s", len(batch), batch)
+        return
+
+    try:
+        with conn.cursor() as cur:
+            execute_values(
+                cur,
+                'INSERT INTO "VoiceAgentLead" ("id", "name", "email", "propertyInterest", "notes", "createdAt") VALUES %s',
+                [(lead["name"], lead["email"], lead["property_interest"], lead["notes"]) for lead in batch],
+                template="(gen_random_uuid()::text, %s, %s, %s, %s, NOW())",
+            )
+        conn.commit()
+    except Exception as e:
+        logger.error("Error saving leads to database: %s. %d lead(s) not saved: %s", e, len(batch), batch)
+        release_db_connection(conn, close=True)
+        return
+    release_db_connection(conn)
+    logger.info("Saved %d lead(s)", len(batch))
@@ -0,0 +1,12 @@
+-- Leads captured by the voice agent's save_lead tool (see leads.py).
+-- Run once against the Midway database before deploying:
+--   psql "$MIDWAY_DATABASE_URL" -f migrations/001_voice_agent_lead.sql
+
+CREATE TABLE IF NOT EXISTS "VoiceAgentLead" (
+    "id" text PRIMARY KEY,
+    "name" text NOT NULL,
+    "email" text NOT NULL,
+    "propertyInterest" text NOT NULL DEFAULT '',
+    "notes" text NOT NULL DEFAULT '',
+    "createdAt" timestamp(3) NOT NULL DEFAULT NOW()
+);
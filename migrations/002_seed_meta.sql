@@ -0,0 +1,9 @@
+-- Digest of the last data seeded by seed_properties.py, so unchanged
+-- re-runs can stop early.
+-- Run once against the Midway database before seeding:
+--   psql "$MIDWAY_DATABASE_URL" -f migrations/002_seed_meta.sql
+
+CREATE TABLE IF NOT EXISTS "_seed_meta" (
+    "name" text PRIMARY KEY,
+    "digest" text NOT NULL
+);
@@ -6,103 +6,221 @@ System keys (property metadata) are prefixed with underscore: _name, _monthly_re
 User-added context has no prefix: pet_policy, wifi_info, etc.
 """
 
+import calendar
 import os
+import threading
+import time
+from datetime import date, datetime
 from typing import Optional
+from zoneinfo import ZoneInfo
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 
 # Database URL for Midway PostgreSQL
 DATABASE_URL = os.getenv("MIDWAY_DATABASE_URL")
 
-# Cache for properties (refreshed on each call for now)
-_properties_cache: list[dict] = []
+# Properties are in Colorado and Wyoming, so "today" means Mountain time
+LOCAL_TIMEZONE = ZoneInfo("America/Denver")
+
+# How long a loaded snapshot of properties is served before re-querying
+CACHE_TTL_SECONDS = 60
+
+# After a failed refresh, keep serving the stale snapshot this long before retrying
+REFRESH_BACKOFF_SECONDS = 10
+
+# Cap each query server-side and detect half-open sockets on pooled connections
+STATEMENT_TIMEOUT_MS = 5000
+
+# Cache for properties: (monotonic timestamp of load, properties, lookup index, summary)
+_properties_cache: tuple[float, list[dict], dict, str] = (0.0, [], {}, "")
+_cache_lock = threading.Lock()
+
+# Shared connection pool, created on first use
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    """Create the connection pool once and reuse it for every query."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=8,
+                    dsn=DATABASE_URL,
+                    connect_timeout=5,
+                    options=f"-c statement_timeout={STATEMENT_TIMEOUT_MS}",
+                    keepalives=1,
+                    keepalives_idle=30,
+                    keepalives_interval=10,
+                    keepalives_count=3,
+                )
+    return _pool
 
 
 def get_db_connection():
-    """Get PostgreSQL connection."""
+    """Get a PostgreSQL connection from the pool."""
     if not DATABASE_URL:
         return None
     try:
-        return psycopg2.connect(DATABASE_URL)
+        return _get_pool().getconn()
     except Exception as e:
         print(f"Database connection error: {e}")
         return None
 
 
+def release_db_connection(conn, close: bool = False) -> None:
+    """Return a connection to the pool, discarding it if it is broken."""
+    if _pool is not None:
+        _pool.putconn(conn, close=close or bool(conn.closed))
+
+
 def load_properties_from_db() -> list[dict]:
     """
-    Load all properties from PropertyContext table.
-    Groups entries by propertyId and separates system keys from user context.
+    Load all properties, served from cache while it is fresh.
+    Falls through to the database once CACHE_TTL_SECONDS have passed.
     """
-    conn = get_db_connection()
-    if not conn:
-        print("Warning: Could not connect to database")
-        return []
+    properties, _, _ = _load_snapshot()
+    return properties
 
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            # Get all property context entries
-            cur.execute('SELECT "propertyId", key, value FROM "PropertyContext" ORDER BY "propertyId"')
-            rows = cur.fetchall()
-        conn.close()
-
-        # Group by propertyId
-        properties_map: dict[str, dict] = {}
-
-        for row in rows:
-            prop_id = row["propertyId"]
-            key = row["key"]
-            value = row["value"]
-
-            if prop_id not in properties_map:
-                properties_map[prop_id] = {
-                    "id": prop_id,
-                    "system": {},  # Keys starting with _
-                    "context": {},  # User-added context
-                }
-
-            if key.startswith("_"):
-                # System key - store without underscore prefix for easier access
-                clean_key = key[1:]  # Remove leading underscore
-                properties_map[prop_id]["system"][clean_key] = value
-            else:
-                # User-added context
-                properties_map[prop_id]["context"][key] = value
-
-        return list(properties_map.values())
 
-    except Exception as e:
-        print(f"Error loading properties from database: {e}")
-        if conn:
-            conn.close()
-        return []
+def invalidate_properties_cache() -> None:
+    """Drop the cached properties so the next load hits the database."""
+    global _properties_cache
+    with _cache_lock:
+        _properties_cache = (0.0, [], {}, "")
 
 
-def find_property(query: str) -> Optional[dict]:
-    """Find a property by name, city, nickname, or bedroom count."""
-    properties = load_properties_from_db()
-    query_lower = query.lower()
+def _load_snapshot() -> tuple[list[dict], dict, str]:
+    """Return the cached properties, lookup index, and summary, refreshing when stale."""
+    global _properties_cache
+
+    loaded_at, properties, index, summary = _properties_cache
+    if properties and time.monotonic() - loaded_at < CACHE_TTL_SECONDS:
+        return properties, index, summary
+
+    with _cache_lock:
+        # Another thread may have refreshed the cache while we waited
+        loaded_at, properties, index, summary = _properties_cache
+        if properties and time.monotonic() - loaded_at < CACHE_TTL_SECONDS:
+            return properties, index, summary
+
+        fresh = _fetch_properties()
+        if not fresh:
+            # Keep answering from the last good snapshot until the database is back,
+            # and hold off re-querying so callers don't each wait on a dead database
+            if properties:
+                retry_at = time.monotonic() - CACHE_TTL_SECONDS + REFRESH_BACKOFF_SECONDS
+                _properties_cache = (retry_at, properties, index, summary)
+            return properties, index, summary
+
+        index = _build_index(fresh)
+        summary = _build_summary(fresh)
+        _properties_cache = (time.monotonic(), fresh, index, summary)
+        return fresh, index, summary
+
+
+def _build_index(properties: list[dict]) -> dict:
+    """
+    Precompute lowercased lookup fields once per load.
+    Exact matches on nickname, city, and bedrooms are dict hits; the substring
+    rules scan the prebuilt (property, city, name, bedrooms) tuples.
+    """
+    index: dict = {"nickname": {}, "city": {}, "bedrooms": {}, "fields": []}
 
     for p in properties:
         sys = p.get("system", {})
-
-        # Match by nickname
         nickname = sys.get("nickname", "").lower()
-        if query_lower == nickname:
+        city = sys.get("city", "").lower()
+        name = sys.get("name", "").lower()
+        bedrooms = sys.get("bedrooms", "").lower()
+
+        # First property wins, matching the order of a linear scan
+        for field, value in (("nickname", nickname), ("city", city), ("bedrooms", bedrooms)):
+            if value:
+                index[field].setdefault(value, p)
+        index["fields"].append((p, city, name, bedrooms))
+
+    return index
+
+
+def _fetch_properties() -> list[dict]:
+    """
+    Load all properties from PropertyContext table.
+    Groups entries by propertyId and separates system keys from user context.
+    """
+    # A pooled connection may have been dropped by the server while idle;
+    # if so, discard it and try once more on a fresh one
+    for attempt in range(2):
+        conn = get_db_connection()
+        if not conn:
+            print("Warning: Could not connect to database")
+            return []
+
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                # Pivot key/value rows into one row per property. System keys
+                # (prefixed with _) are stored without the underscore for easier access.
+                cur.execute('''
+                    SELECT "propertyId",
+                           jsonb_object_agg(substring(key from 2), value) FILTER (WHERE left(key, 1) = '_') AS system,
+                           jsonb_object_agg(key, value) FILTER (WHERE left(key, 1) <> '_') AS context
+                    FROM "PropertyContext"
+                    GROUP BY "propertyId"
+                    ORDER BY "propertyId"
+                ''')
+                rows = cur.fetchall()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            release_db_connection(conn, close=True)
+            if attempt == 0:
+                continue
+            print(f"Error loading properties from database: {e}")
+            return []
+        except Exception as e:
+            print(f"Error loading properties from database: {e}")
+            release_db_connection(conn, close=True)
+            return []
+        release_db_connection(conn)
+        break
+
+    return [
+        {"id": row["propertyId"], "system": row["system"] or {}, "context": row["context"] or {}}
+        for row in rows
+    ]
+
+
+def find_property(query: str) -> tuple[Optional[dict], list[dict]]:
+    """
+    Find a property by name, city, nickname, or bedroom count.
+    Returns the match along with the loaded properties so callers can reuse them.
+    """
+    properties, index, _ = _load_snapshot()
+    return _find_in(index, query), properties
+
+
+def _find_in(index: dict, query: str) -> Optional[dict]:
+    """Match a query against the lookup index of already-loaded properties."""
+    query_lower = query.lower()
+
+    # Exact matches by nickname, city, or bedroom count
+    for field in ("nickname", "city", "bedrooms"):
+        p = index.get(field, {}).get(query_lower)
+        if p:
             return p
 
+    for p, city, name, bedrooms in index.get("fields", []):
         # Match by city
-        city = sys.get("city", "").lower()
         if city and (query_lower in city or city in query_lower):
             return p
 
         # Match by name
-        name = sys.get("name", "").lower()
         if name and query_lower in name:
             return p
 
         # Match by bedroom count
-        bedrooms = sys.get("bedrooms", "").lower()
         if bedrooms and (query_lower in bedrooms or bedrooms in query_lower):
             return p
 
@@ -117,11 +235,16 @@ def find_property(query: str) -> Optional[dict]:
 
 def get_all_properties() -> str:
     """Return summary of all available properties."""
-    properties = load_properties_from_db()
+    properties, _, summary = _load_snapshot()
 
     if not properties:
         return "I'm sorry, I couldn't load property information right now. Please try again later."
 
+    return summary
+
+
+def _build_summary(properties: list[dict]) -> str:
+    """Render the spoken summary of all properties once per load."""
     summaries = []
     for p in properties:
         sys = p.get("system", {})
@@ -139,12 +262,17 @@ def get_all_properties() -> str:
     return ". ".join(summaries) + "."
 
 
-def get_property_details(property_name: str) -> str:
-    """Get detailed info about a specific property."""
-    p = find_property(property_name)
+def get_property_details(property_name: str, move_in: str = "", move_out: str = "") -> str:
+    """
+    Get detailed info about a specific property.
+    When move-in/move-out dates are given, also says whether they work.
+    """
+    p, properties = find_property(property_name)
+
+    if not properties:
+        return "I'm sorry, I couldn't load property information right now. Please try again later."
 
     if not p:
-        properties = load_properties_from_db()
         available = [prop.get("system", {}).get("city", "unknown") for prop in properties]
         return f"I don't have a property matching that. We have places in {', '.join(available)}."
 
@@ -168,21 +296,54 @@ def get_property_details(property_name: str) -> str:
         parts.append(f"pets: {pets.lower()}")
     if deposit:
         parts.append(f"${deposit} deposit")
+    if move_in:
+        parts.append(_check_dates(sys, move_in, move_out))
 
     return ". ".join(parts) + "."
 
 
-def check_availability(property_name: str, move_in: str, move_out: str) -> str:
-    """Check if property works for given dates."""
-    p = find_property(property_name)
-
-    if not p:
-        return "I couldn't find that property."
-
-    sys = p.get("system", {})
-    name = sys.get("name", "the property")
-    available_from = sys.get("available_from", "unknown")
-    available_until = sys.get("available_until", "open ended")
+def _check_dates(sys: dict, move_in: str, move_out: str) -> str:
+    """Check requested YYYY-MM-DD dates against a property's availability window."""
+    available_from = sys.get("available_from", "")
+    available_until = sys.get("available_until", "")
     min_stay = sys.get("minimum_stay", "1")
 
-    return f"{name} is available from {available_from}. Minimum stay is {min_stay} month. Your dates: {move_in} to {move_out}."
+    try:
+        start = date.fromisoformat(move_in)
+        end = date.fromisoformat(move_out) if move_out else None
+    except ValueError:
+        return f"Minimum stay is {min_stay} month. Your dates: {move_in} to {move_out or 'open ended'}"
+
+    if end and end < start:
+        return f"The move-out date {move_out} is before the move-in date {move_in}"
+    if start < datetime.now(LOCAL_TIMEZONE).date():
+        return f"The move-in date {move_in} has already passed"
+
+    opens = _parse_availability_date(available_from)
+    closes = _parse_availability_date(available_until)
+
+    if opens and start < opens:
+        return f"Not available until {available_from}, so {move_in} is too early"
+    if closes and end and end > closes:
+        return f"Only available until {available_until}, so {move_out} is too late"
+    if end and min_stay.isdigit() and end < _add_months(start, int(min_stay)):
+        return f"Those dates are shorter than the {min_stay} month minimum stay"
+    return "Those dates work"
+
+
+def _add_months(day: date, months: int) -> date:
+    """Same day of the month, `months` later; clamped to the month's last day."""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _parse_availability_date(value: str) -> Optional[date]:
+    """Parse stored availability text like 'January 15, 2025' or '2025-01-15'."""
+    for fmt in ("%Y-%m-%d", "%B %d, %Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    # 'Available now', 'Open ended', or anything else free-form
+    return None
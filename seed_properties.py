@@ -2,12 +2,21 @@
 """
 Seed script to populate PropertyContext table with property data.
 Run once to migrate from hardcoded properties to database.
+Property data is read from properties.json next to this script.
 
-Usage: python seed_properties.py
+Usage: python seed_properties.py [--verbose] [--force]
 """
 
+import argparse
+import functools
+import hashlib
+import json
 import os
-import psycopg2
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,107 +25,164 @@ DATABASE_URL = os.getenv("MIDWAY_DATABASE_URL")
 # Owner user ID from Midway config
 USER_ID = "user_361g0w0bgM843cVdiNG4ZyL6Z1p"
 
+# Connection pool, created on first seed so repeat calls skip the handshake
+_POOL: Optional[ThreadedConnectionPool] = None
+
+# Statements are bytes so psycopg2 doesn't re-encode them on every run
+_LOCK_SQL = b"SELECT pg_try_advisory_xact_lock(hashtext('seed_properties'))"
+_ASYNC_COMMIT_SQL = b"SET LOCAL synchronous_commit = off"
+
+# Digest of the last seeded data, so unchanged re-runs can stop early.
+# The table comes from migrations/002_seed_meta.sql.
+_SEED_DIGEST_SELECT_SQL = b'''SELECT "digest" FROM "_seed_meta" WHERE "name" = 'properties' '''
+_SEED_DIGEST_UPSERT_SQL = b'''
+    INSERT INTO "_seed_meta" ("name", "digest") VALUES ('properties', %s)
+    ON CONFLICT ("name") DO UPDATE SET "digest" = EXCLUDED."digest"
+'''
+
+# Upsert every seeded key, bound as parallel id/propertyId/key/value arrays.
+# Unchanged values are skipped and don't appear in RETURNING.
+_UPSERT_SQL = b'''
+    INSERT INTO "PropertyContext" ("id", "propertyId", "key", "value", "userId", "createdAt", "updatedAt")
+    SELECT i, p, k, v, %s, %s, %s
+    FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[]) AS t(i, p, k, v)
+    ON CONFLICT ("propertyId", "key")
+    DO UPDATE SET "value" = EXCLUDED."value", "updatedAt" = EXCLUDED."updatedAt"
+    WHERE "PropertyContext"."value" IS DISTINCT FROM EXCLUDED."value"
+    RETURNING "propertyId", "key", (xmax = 0) AS inserted
+'''
+
 # Property data to seed (using underscore prefix for system keys)
-PROPERTIES_TO_SEED = [
-    {
-        "propertyId": "725012_1",
-        "data": {
-            "_name": "Beautiful Centrally Located 1 Bdrm Monthly Rental",
-            "_nickname": "boulder",
-            "_address": "2610 Iris Avenue, Apt 107",
-            "_city": "Boulder",
-            "_state": "Colorado",
-            "_bedrooms": "1",
-            "_bathrooms": "1",
-            "_layout": "One bedroom apartment, fully furnished",
-            "_monthly_rent": "2200",
-            "_utilities_included": "true",
-            "_minimum_stay": "1",
-            "_amenities": "Full kitchen,Washer/dryer in unit,WiFi included,Free parking,Air conditioning,Heating",
-            "_pets": "Allowed (pet deposit required)",
-            "_smoking": "Not allowed",
-            "_available_from": "January 15, 2025",
-            "_available_until": "Open ended",
-        }
-    },
-    {
-        "propertyId": "433442_1",
-        "data": {
-            "_name": "Blue Door Studio Downtown Lander Loft",
-            "_nickname": "lander",
-            "_address": "744 Lincoln Street",
-            "_city": "Lander",
-            "_state": "Wyoming",
-            "_bedrooms": "Studio",
-            "_bathrooms": "1",
-            "_size_sqft": "800",
-            "_beds": "1 Queen Bed",
-            "_layout": "Open concept craftsman loft with high ceilings and bohemian modern furniture",
-            "_monthly_rent": "1200",
-            "_utilities_included": "true",
-            "_cleaning_fee": "100",
-            "_deposit": "1000",
-            "_pet_deposit": "400",
-            "_minimum_stay": "1",
-            "_amenities": "Full kitchen with essentials,Washer/dryer in unit,WiFi included,Samsung Smart TV,Free parking on premises,Gym access,Air conditioning,Heating,Professional cleaning",
-            "_pets": "Allowed ($400 refundable pet deposit)",
-            "_smoking": "Not allowed",
-            "_accessibility": "Stairs at entrance",
-            "_available_from": "Available now",
-            "_available_until": "Open ended",
-        }
-    }
-]
-
-
-def seed_properties():
-    """Insert property data into PropertyContext table."""
+SEED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "properties.json")
+
+
+@functools.lru_cache(maxsize=None)
+def load_seed_properties() -> list[dict]:
+    """Load the property data to seed, reading the JSON file once."""
+    with open(SEED_FILE) as f:
+        return json.load(f)
+
+
+def seed_digest() -> str:
+    """SHA-256 of the seed data, independent of key order."""
+    return hashlib.sha256(json.dumps(load_seed_properties(), sort_keys=True).encode()).hexdigest()
+
+
+def _upsert_seed(cur, force: bool) -> tuple[str, list[tuple], int]:
+    """
+    Run the seed statements on an open transaction.
+    Returns (status, RETURNING rows, number of rows sent); status is
+    "locked", "unchanged", or "seeded".
+    """
+    # Only one seeder at a time; the lock is released at COMMIT/ROLLBACK
+    cur.execute(_LOCK_SQL)
+    if not cur.fetchone()[0]:
+        return "locked", [], 0
+
+    # The seed is idempotent, so losing this commit in a crash is
+    # harmless; skip waiting for the WAL flush
+    cur.execute(_ASYNC_COMMIT_SQL)
+
+    digest = seed_digest()
+    cur.execute(_SEED_DIGEST_SELECT_SQL)
+    row = cur.fetchone()
+    if row and row[0] == digest and not force:
+        return "unchanged", [], 0
+
+    # Bind every key of every property as parallel arrays and upsert
+    # them all in a single statement. Row ids are generated here so
+    # the server doesn't call gen_random_uuid() per row.
+    ids, property_ids, keys, values = [], [], [], []
+    for prop in load_seed_properties():
+        for key, value in prop["data"].items():
+            ids.append(str(uuid.uuid4()))
+            property_ids.append(prop["propertyId"])
+            keys.append(key)
+            values.append(value)
+
+    # One timestamp for the whole seed, used for createdAt and updatedAt
+    now = datetime.now(timezone.utc)
+    cur.execute(_UPSERT_SQL, (USER_ID, now, now, ids, property_ids, keys, values))
+    results = cur.fetchall()
+    cur.execute(_SEED_DIGEST_UPSERT_SQL, (digest,))
+
+    return "seeded", results, len(keys)
+
+
+def seed_properties(verbose: bool = False, force: bool = False):
+    """
+    Insert property data into PropertyContext table. Set verbose to list every key.
+    Does nothing if this exact data was already seeded, unless force is set.
+    The check only covers properties.json: rows edited or deleted directly in
+    the database still count as unchanged, so use force to restore them.
+    """
+    global _POOL
+
     if not DATABASE_URL:
         print("Error: MIDWAY_DATABASE_URL not set in .env")
         return False
 
     try:
-        conn = psycopg2.connect(DATABASE_URL)
-        cur = conn.cursor()
-
-        total_inserted = 0
-        total_updated = 0
-
-        for prop in PROPERTIES_TO_SEED:
-            property_id = prop["propertyId"]
-            print(f"\nSeeding property: {property_id}")
-
-            for key, value in prop["data"].items():
-                # Upsert: insert or update on conflict
-                cur.execute('''
-                    INSERT INTO "PropertyContext" ("id", "propertyId", "key", "value", "userId", "createdAt", "updatedAt")
-                    VALUES (gen_random_uuid()::text, %s, %s, %s, %s, NOW(), NOW())
-                    ON CONFLICT ("propertyId", "key")
-                    DO UPDATE SET "value" = EXCLUDED."value", "updatedAt" = NOW()
-                    RETURNING (xmax = 0) AS inserted
-                ''', (property_id, key, value, USER_ID))
-
-                result = cur.fetchone()
-                if result and result[0]:
-                    total_inserted += 1
-                    print(f"  + Inserted: {key}")
-                else:
-                    total_updated += 1
-                    print(f"  ~ Updated: {key}")
-
-        conn.commit()
-        cur.close()
-        conn.close()
-
-        print(f"\n✅ Seed complete!")
-        print(f"   Inserted: {total_inserted} new entries")
-        print(f"   Updated: {total_updated} existing entries")
-        return True
+        if _POOL is None:
+            _POOL = ThreadedConnectionPool(1, 4, DATABASE_URL)
+        conn = _POOL.getconn()
+    except Exception as e:
+        print(f"❌ Error seeding database: {e}")
+        return False
+
+    # Everything below must run as one transaction so the advisory lock is
+    # held for the whole upsert, and a single commit avoids a WAL flush per statement
+    autocommit = conn.autocommit
+    conn.autocommit = False
+
+    try:
+        with conn, conn.cursor() as cur:
+            status, results, total_rows = _upsert_seed(cur, force)
 
     except Exception as e:
         print(f"❌ Error seeding database: {e}")
         return False
 
+    finally:
+        # Keep the connection open in the pool unless it broke
+        if not conn.closed:
+            conn.autocommit = autocommit
+        _POOL.putconn(conn, close=bool(conn.closed))
+
+    # All output happens after COMMIT so no locks are held while printing
+    if status == "locked":
+        print("Another seed is already running, skipping.")
+        return True
+    if status == "unchanged":
+        print("✅ Seed data unchanged since last run, nothing to do.")
+        return True
+
+    total_inserted = sum(1 for _, _, inserted in results if inserted)
+    total_updated = len(results) - total_inserted
+    # Rows whose value didn't change are skipped and not returned
+    total_unchanged = total_rows - len(results)
+
+    if verbose:
+        # Build the listing first and write it in one call
+        lines = []
+        current_property = None
+        for property_id, key, inserted in results:
+            if property_id != current_property:
+                current_property = property_id
+                lines.append(f"\nSeeding property: {property_id}")
+            lines.append(f"  + Inserted: {key}" if inserted else f"  ~ Updated: {key}")
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    print(f"\n✅ Seed complete!")
+    print(f"   Inserted: {total_inserted} new entries")
+    print(f"   Updated: {total_updated} existing entries")
+    print(f"   Unchanged: {total_unchanged} entries")
+    return True
+
 
 if __name__ == "__main__":
-    seed_properties()
+    parser = argparse.ArgumentParser(description="Seed PropertyContext with property data.")
+    parser.add_argument("--verbose", action="store_true", help="list every inserted/updated key")
+    parser.add_argument("--force", action="store_true", help="seed even if the data is unchanged since the last run")
+    args = parser.parse_args()
+    seed_properties(verbose=args.verbose, force=args.force)
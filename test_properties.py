@@ -0,0 +1,82 @@
+"""
+Behavior checks for the move-in/move-out date logic in properties.py.
+These don't touch the database.
+
+Usage: python -m pytest
+"""
+
+from datetime import date
+
+import pytest
+
+from properties import _add_months, _check_dates, _parse_availability_date
+
+
+# Far enough out that "today" never catches up with these tests
+WINDOW = {
+    "available_from": "January 15, 2099",
+    "available_until": "2099-12-31",
+    "minimum_stay": "1",
+}
+
+
+@pytest.mark.parametrize("day, months, expected", [
+    (date(2099, 1, 15), 1, date(2099, 2, 15)),
+    (date(2099, 1, 31), 1, date(2099, 2, 28)),
+    (date(2096, 1, 31), 1, date(2096, 2, 29)),
+    (date(2099, 3, 31), 1, date(2099, 4, 30)),
+    (date(2099, 11, 30), 3, date(2100, 2, 28)),
+    (date(2099, 5, 10), 12, date(2100, 5, 10)),
+])
+def test_add_months_clamps_to_month_end(day, months, expected):
+    assert _add_months(day, months) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2099-01-15", date(2099, 1, 15)),
+    ("January 15, 2099", date(2099, 1, 15)),
+    ("Available now", None),
+    ("", None),
+])
+def test_parse_availability_date(value, expected):
+    assert _parse_availability_date(value) == expected
+
+
+def test_dates_inside_window_work():
+    assert _check_dates(WINDOW, "2099-02-01", "2099-03-01") == "Those dates work"
+
+
+def test_open_ended_stay_works():
+    assert _check_dates(WINDOW, "2099-02-01", "") == "Those dates work"
+
+
+def test_reversed_range_is_rejected():
+    assert "before the move-in date" in _check_dates(WINDOW, "2099-03-01", "2099-02-01")
+
+
+def test_past_move_in_is_rejected():
+    assert "already passed" in _check_dates({}, "2000-01-01", "2000-03-01")
+
+
+def test_move_in_before_available_from():
+    assert "too early" in _check_dates(WINDOW, "2099-01-10", "2099-03-01")
+
+
+def test_move_out_after_available_until():
+    assert "too late" in _check_dates(WINDOW, "2099-02-01", "2100-01-15")
+
+
+def test_minimum_stay_uses_calendar_months():
+    # Jan 31 + 1 month is Feb 28, which 30-day arithmetic would get wrong
+    sys = {**WINDOW, "minimum_stay": "1"}
+    assert _check_dates(sys, "2099-01-31", "2099-02-28") == "Those dates work"
+    assert "minimum stay" in _check_dates(sys, "2099-01-31", "2099-02-27")
+
+    sys = {**WINDOW, "minimum_stay": "2"}
+    assert _check_dates(sys, "2099-03-15", "2099-05-15") == "Those dates work"
+    assert "minimum stay" in _check_dates(sys, "2099-03-15", "2099-05-14")
+
+
+def test_unparseable_dates_fall_back_to_minimum_stay():
+    result = _check_dates(WINDOW, "next March", "")
+    assert result == "Minimum stay is 1 month. Your dates: next March to open ended"